@@ -0,0 +1,362 @@
+"""ASGI serving mode: hot reads on an asyncio database engine, the rest on Flask.
+
+GET /products/<id>, /users/<id>, /users/<id>/stats and /orders/<id>/products
+without a query string are answered by coroutines that query through
+SQLAlchemy's asyncio engine, so a request waiting on the database holds a
+pooled connection but no thread. Every other request is handed to the Flask
+app on a thread pool of ASYNC_WSGI_THREADS workers, exactly as under a WSGI
+server.
+
+Both paths share the Flask app's product cache, generation tokens, JSON
+provider, logger and metrics registry, so a write served by Flask
+invalidates what the async routes serve and the ETags, bodies and /metrics
+series are the same whichever path answered. The product cache is called
+from the event loop, so it should be the in-process LRUCache or another
+non-blocking backend.
+
+Needs an async driver for the database: aiomysql for MySQL (see
+ASYNC_DB_DRIVER) or aiosqlite for a file-based SQLite database. Run it
+with any ASGI server:
+
+    uvicorn --factory asgi:create_asgi_app
+"""
+import asyncio
+import io
+import logging
+import re
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from werkzeug.exceptions import NotFound
+from werkzeug.http import parse_etags
+
+from app import (
+    Order, Product, User, build_engine_options, content_etag, create_app, db, get_product_cache, logger,
+    order_products_etag, order_products_statement, product_cache_key, product_serializer,
+    request_id_var, user_serializer, user_stats_from_rows, user_stats_statement,
+)
+
+# Error message of Flask's get_or_404, reused so both paths return the same 404 body
+NOT_FOUND_MESSAGE = str(NotFound())
+
+def build_async_database_uri(config):
+    """Async SQLAlchemy URI: ASYNC_SQLALCHEMY_DATABASE_URI, or the sync URI with an async driver."""
+    if config.get('ASYNC_SQLALCHEMY_DATABASE_URI'):
+        return config['ASYNC_SQLALCHEMY_DATABASE_URI']
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    if url.get_backend_name() == 'sqlite':
+        if url.database in (None, '', ':memory:'):
+            raise ValueError("The ASGI mode needs a file-based SQLite database shared by both engines")
+        return url.set(drivername='sqlite+aiosqlite')
+    return url.set(drivername=f"{url.get_backend_name()}+{config['ASYNC_DB_DRIVER']}")
+
+def build_async_engine_options(config):
+    """DB_POOL_* engine options for the async engine, which sizes its own pool class."""
+    options = build_engine_options(config)
+    options.pop('poolclass', None)
+    return options
+
+def build_environ(scope, body):
+    """WSGI environ for an ASGI HTTP scope with a fully read request body."""
+    path = scope['path']
+    root_path = scope.get('root_path', '')
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': root_path.encode('utf8').decode('latin1'),
+        'PATH_INFO': path.encode('utf8').decode('latin1'),
+        'QUERY_STRING': scope['query_string'].decode('latin1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1] or 80),
+        'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'], environ['REMOTE_PORT'] = scope['client'][0], str(scope['client'][1])
+    for name, value in scope['headers']:
+        name = name.decode('latin1')
+        if name == 'content-length':
+            key = 'CONTENT_LENGTH'
+        elif name == 'content-type':
+            key = 'CONTENT_TYPE'
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        value = value.decode('latin1')
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    # The body is already buffered, so its length is known even for chunked uploads
+    environ['CONTENT_LENGTH'] = str(len(body))
+    return environ
+
+class HotRequest:
+    """Request state for a route served on the async path."""
+
+    def __init__(self, scope):
+        headers = dict(scope['headers'])
+        self.method = scope['method']
+        self.path = scope['path']
+        self.request_id = headers.get(b'x-request-id', b'').decode('latin1') or uuid.uuid4().hex
+        self.if_none_match = parse_etags(headers.get(b'if-none-match', b'').decode('latin1') or None)
+        self.start = time.perf_counter()
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.serialize_seconds = 0.0
+
+    def is_not_modified(self, etag):
+        """Return True if the request's If-None-Match already covers etag."""
+        return self.if_none_match.contains_weak(etag)
+
+    def dump(self, serializer, obj, many=False):
+        """Serialize with a FastSerializer, counting the time towards serialization metrics."""
+        start = time.perf_counter()
+        data = serializer.dump(obj, many=many)
+        self.serialize_seconds += time.perf_counter() - start
+        return data
+
+class AsyncApp:
+    """ASGI application serving hot GET routes itself and delegating the rest to Flask."""
+
+    def __init__(self, flask_app, engine, executor):
+        self.flask_app = flask_app
+        self.engine = engine
+        self.executor = executor
+        # (path pattern, Flask rule for metrics, handler); matched only for GET without a query string
+        self.routes = [
+            (re.compile(r"/products/(\d+)"), '/products/<int:id>', self.get_product),
+            (re.compile(r"/users/(\d+)"), '/users/<int:id>', self.get_user),
+            (re.compile(r"/users/(\d+)/stats"), '/users/<int:id>/stats', self.get_user_stats),
+            (re.compile(r"/orders/(\d+)/products"), '/orders/<int:order_id>/products', self.get_order_products),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'http':
+            route = self.match(scope)
+            if route is None:
+                await self.call_wsgi(scope, receive, send)
+            else:
+                await self.serve(scope, send, *route)
+        else:
+            raise RuntimeError(f"Unsupported ASGI scope type {scope['type']!r}")
+
+    async def lifespan(self, receive, send):
+        """Acknowledge startup and dispose of the engine and thread pool on shutdown."""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def match(self, scope):
+        """Return (rule, handler, id) for a hot route, or None to defer to Flask."""
+        if scope['method'] != 'GET' or scope['query_string']:
+            return None
+        path = scope['path'][len(scope.get('root_path', '')):]
+        for pattern, rule, handler in self.routes:
+            found = pattern.fullmatch(path)
+            if found:
+                return rule, handler, int(found.group(1))
+        return None
+
+    # ------------------------------------------------------------------
+    # WSGI fallback
+    # ------------------------------------------------------------------
+
+    async def call_wsgi(self, scope, receive, send):
+        """Run the Flask app for this request on the thread pool, streaming its response."""
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self.run_wsgi, build_environ(scope, bytes(body)), send, loop)
+
+    def run_wsgi(self, environ, send, loop):
+        """Call the WSGI app in a worker thread, forwarding each body chunk to the event loop."""
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response['start'] = {
+                'type': 'http.response.start',
+                'status': int(status.split(' ', 1)[0]),
+                'headers': [(name.lower().encode('latin1'), value.encode('latin1')) for name, value in headers],
+            }
+
+        def send_sync(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        chunks = self.flask_app.wsgi_app(environ, start_response)
+        try:
+            started = False
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                if not started:
+                    send_sync(response['start'])
+                    started = True
+                send_sync({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            if not started:
+                send_sync(response['start'])
+            send_sync({'type': 'http.response.body', 'body': b''})
+        finally:
+            if hasattr(chunks, 'close'):
+                chunks.close()
+
+    # ------------------------------------------------------------------
+    # Hot routes
+    # ------------------------------------------------------------------
+
+    async def execute(self, req, statement):
+        """Run one statement on a pooled async connection and return its buffered result."""
+        start = time.perf_counter()
+        async with self.engine.connect() as conn:
+            result = await conn.execute(statement)
+        req.sql_count += 1
+        req.sql_seconds += time.perf_counter() - start
+        return result
+
+    async def serve(self, scope, send, rule, handler, id):
+        """Run a hot route handler, then log, record metrics and send the response."""
+        req = HotRequest(scope)
+        token = request_id_var.set(req.request_id)
+        try:
+            with self.flask_app.app_context():
+                status, data, etag = await handler(req, id)
+                body = b"" if data is None else (self.flask_app.json.dumps(data) + "\n").encode()
+                headers = [(b'x-request-id', req.request_id.encode('latin1'))]
+                if data is not None:
+                    headers.append((b'content-type', b'application/json'))
+                    headers.append((b'content-length', str(len(body)).encode()))
+                if etag is not None:
+                    headers.append((b'etag', f'"{etag}"'.encode()))
+                self.finish(req, rule, status, len(body))
+        finally:
+            request_id_var.reset(token)
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+    def finish(self, req, rule, status, size):
+        """Write the access record and request metrics the Flask hooks would have."""
+        seconds = time.perf_counter() - req.start
+        level = logging.INFO if status < 400 else logging.WARNING
+        if status >= 500:
+            level = logging.ERROR
+        logger.log(level, "%s %s %s", req.method, req.path, status, extra={
+            "method": req.method,
+            "path": req.path,
+            "status": status,
+            "duration_ms": round(seconds * 1000, 3),
+        })
+        metrics = self.flask_app.extensions.get('metrics')
+        if metrics is not None:
+            metrics.observe(rule, req.method, status, seconds, req.sql_count, req.sql_seconds,
+                            req.serialize_seconds, size)
+
+    async def get_product(self, req, id):
+        """Async GET /products/<id>, sharing the cached {etag, data} entries with Flask."""
+        try:
+            key = product_cache_key(id)
+            entry = get_product_cache().get(key)
+            if entry is None:
+                result = await self.execute(
+                    req, db.select(*product_serializer.columns(Product)).where(Product.id == id))
+                row = result.first()
+                if row is None:
+                    logger.warning("Failed to retrieve product with ID %s - %s", id, NOT_FOUND_MESSAGE)
+                    return 404, {"error": NOT_FOUND_MESSAGE}, None
+                data = req.dump(product_serializer, row)
+                entry = {"etag": content_etag(data), "data": data}
+                get_product_cache().set(key, entry)
+            if req.is_not_modified(entry["etag"]):
+                logger.info("Product with ID %s not modified", id)
+                return 304, None, entry["etag"]
+            logger.info("Retrieved product with ID %s", id)
+            return 200, entry["data"], entry["etag"]
+        except Exception as e:
+            logger.warning("Failed to retrieve product with ID %s - %s", id, e)
+            return 404, {"error": str(e)}, None
+
+    async def get_user(self, req, id):
+        """Async GET /users/<id>."""
+        try:
+            result = await self.execute(req, db.select(*user_serializer.columns(User)).where(User.id == id))
+            row = result.first()
+            if row is None:
+                logger.warning("Failed to retrieve user with ID %s - %s", id, NOT_FOUND_MESSAGE)
+                return 404, {"error": NOT_FOUND_MESSAGE}, None
+            logger.info("Retrieved user with ID %s", id)
+            return 200, req.dump(user_serializer, row), None
+        except Exception as e:
+            logger.warning("Failed to retrieve user with ID %s - %s", id, e)
+            return 404, {"error": str(e)}, None
+
+    async def get_user_stats(self, req, id):
+        """Async GET /users/<id>/stats."""
+        try:
+            result = await self.execute(req, user_stats_statement([id]))
+            stats = user_stats_from_rows(result.all()).get(id)
+        except Exception as e:
+            logger.error("Failed to compute stats for user with ID %s - %s", id, e)
+            return 500, {"error": str(e)}, None
+
+        if stats is None:
+            logger.warning("Failed to compute stats for user with ID %s - User not found", id)
+            return 404, {"error": "User not found"}, None
+        logger.info("Computed stats for user with ID %s", id)
+        return 200, stats, None
+
+    async def get_order_products(self, req, order_id):
+        """Async GET /orders/<order_id>/products with the same generation ETag as Flask."""
+        try:
+            etag = order_products_etag(order_id, "")
+            if req.is_not_modified(etag):
+                logger.info("Products for order ID %s not modified", order_id)
+                return 304, None, etag
+            result = await self.execute(
+                req, order_products_statement(product_serializer.columns(Product, with_id=True), order_id))
+            products = result.all()
+            if not products:
+                result = await self.execute(req, db.select(Order.id).where(Order.id == order_id))
+                if result.first() is None:
+                    logger.warning("Failed to retrieve products for order ID %s - %s", order_id, NOT_FOUND_MESSAGE)
+                    return 404, {"error": NOT_FOUND_MESSAGE}, None
+            logger.info("Retrieved products for order ID %s", order_id)
+            return 200, req.dump(product_serializer, products, many=True), etag
+        except Exception as e:
+            logger.warning("Failed to retrieve products for order ID %s - %s", order_id, e)
+            return 404, {"error": str(e)}, None
+
+def create_asgi_app(config=None):
+    """Create the Flask app and wrap it in the async serving layer.
+
+    Takes the same config argument as create_app; the async engine is
+    created here but connects on first use.
+    """
+    flask_app = create_app(config)
+    engine = create_async_engine(
+        build_async_database_uri(flask_app.config), **build_async_engine_options(flask_app.config)
+    )
+    executor = ThreadPoolExecutor(
+        max_workers=int(flask_app.config['ASYNC_WSGI_THREADS']), thread_name_prefix='wsgi'
+    )
+    return AsyncApp(flask_app, engine, executor)
@@ -0,0 +1,247 @@
+"""Compare concurrent read throughput of the WSGI app and the ASGI mode.
+
+Seeds a temporary SQLite file, checks that asgi.py answers every hot route
+with the same status, body and ETag as the Flask app, then drives the same
+mix of GET /products/<id>, /users/<id>, /users/<id>/stats and
+/orders/<id>/products requests at each concurrency level through:
+
+- sync: the Flask app on a fixed pool of --threads worker threads, as under
+  a threaded WSGI server;
+- async: the ASGI app with that many requests in flight on one event loop.
+
+Both use a connection pool of --pool-size. Every SQL statement is delayed by
+--db-latency-ms inside the driver's own thread to stand in for a network
+round trip to MySQL. The product cache is cleared before every run, so both
+modes start cold on the same request sequence.
+
+Usage: python benchmarks/bench_async.py [--rows N] [--requests N] [--concurrency 8,64,256]
+                                        [--threads N] [--pool-size N] [--db-latency-ms MS] [--output FILE]
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app as ecommerce  # noqa: E402
+import asgi  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+
+def seed(rows, rng):
+    """Insert users, products and orders with three priced lines each."""
+    db = ecommerce.db
+    db.create_all()
+    db.session.execute(db.insert(ecommerce.User), [
+        {"name": f"User {i}", "address": f"{i} Bench Street", "email": f"user-{i}@example.com"}
+        for i in range(rows)
+    ])
+    prices = [round(rng.uniform(1, 500), 2) for _ in range(rows)]
+    db.session.execute(db.insert(ecommerce.Product), [
+        {"product_name": f"Product {i}", "price": price} for i, price in enumerate(prices)
+    ])
+    now = datetime.datetime.utcnow()
+    db.session.execute(db.insert(ecommerce.Order), [
+        {"user_id": rng.randint(1, rows), "order_date": now - datetime.timedelta(minutes=i)}
+        for i in range(rows)
+    ])
+    db.session.execute(db.insert(ecommerce.OrderProduct), [
+        {"order_id": order_id, "product_id": product_id,
+         "quantity": rng.randint(1, 5), "unit_price": prices[product_id - 1]}
+        for order_id in range(1, rows + 1)
+        for product_id in rng.sample(range(1, rows + 1), 3)
+    ])
+    db.session.commit()
+    ecommerce.rebuild_order_summaries()
+
+
+def add_latency(engine, seconds, is_async):
+    """Sleep for seconds before every statement, in the thread that runs the SQLite call."""
+    def trace(statement):
+        time.sleep(seconds)
+
+    @event.listens_for(engine, 'connect')
+    def connect(dbapi_connection, connection_record):
+        if is_async:
+            dbapi_connection.await_(dbapi_connection.driver_connection.set_trace_callback(trace))
+        else:
+            dbapi_connection.set_trace_callback(trace)
+
+
+def build_paths(rows, count, rng):
+    """Random mix of hot route paths."""
+    templates = ("/products/{}", "/users/{}", "/users/{}/stats", "/orders/{}/products")
+    return [rng.choice(templates).format(rng.randint(1, rows)) for _ in range(count)]
+
+
+async def call_asgi(app, path, headers=()):
+    """Send one GET through an ASGI app in-process; return (status, headers, body)."""
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app({
+        'type': 'http', 'method': 'GET', 'path': path, 'root_path': '', 'query_string': b'',
+        'headers': [(name.lower().encode(), value.encode()) for name, value in headers],
+        'http_version': '1.1', 'scheme': 'http', 'server': ('bench', 80), 'client': ('127.0.0.1', 0),
+    }, receive, send)
+    return messages[0]['status'], dict(messages[0]['headers']), b"".join(m.get('body', b'') for m in messages[1:])
+
+
+def summarize(latencies, seconds):
+    """Throughput and latency percentiles for one run."""
+    latencies = sorted(latencies)
+    return {
+        "requests_per_second": len(latencies) / seconds,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def run_sync(flask_app, paths, threads, concurrency):
+    """Serve paths with concurrency clients in flight on a pool of worker threads."""
+    client = flask_app.test_client()
+    workers = ThreadPoolExecutor(max_workers=threads)
+
+    def request(path):
+        start = time.perf_counter()
+        status = client.get(path).status_code
+        return status, time.perf_counter() - start
+
+    async def drive():
+        loop = asyncio.get_running_loop()
+        limit = asyncio.Semaphore(concurrency)
+
+        async def one(path):
+            async with limit:
+                start = time.perf_counter()
+                status, _ = await loop.run_in_executor(workers, request, path)
+                return status, time.perf_counter() - start
+
+        return await asyncio.gather(*(one(path) for path in paths))
+
+    start = time.perf_counter()
+    results = asyncio.run(drive())
+    seconds = time.perf_counter() - start
+    workers.shutdown()
+    return results, seconds
+
+
+async def run_async(asgi_app, paths, concurrency):
+    """Serve paths with concurrency requests in flight on the event loop."""
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one(path):
+        async with limit:
+            start = time.perf_counter()
+            status, _, _ = await call_asgi(asgi_app, path)
+            return status, time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(path) for path in paths))
+    return results, time.perf_counter() - start
+
+
+async def check_parity(asgi_app, client, paths):
+    """Fail unless both paths return the same status, body and ETag, and honour If-None-Match."""
+    for path in paths:
+        status, headers, body = await call_asgi(asgi_app, path)
+        expected = client.get(path)
+        etag = headers.get(b'etag', b'').decode()
+        if (status, json.loads(body), etag) != (expected.status_code, expected.get_json(), expected.headers.get('ETag', '')):
+            raise SystemExit(f"{path}: async response differs from Flask")
+        if etag and (await call_asgi(asgi_app, path, [('If-None-Match', etag)]))[0] != 304:
+            raise SystemExit(f"{path}: If-None-Match not honoured")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', default="8,64,256")
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--pool-size', type=int, default=32)
+    parser.add_argument('--db-latency-ms', type=float, default=2.0)
+    parser.add_argument('--output', help="write results JSON here instead of stdout")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        asgi_app = asgi.create_asgi_app({
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            "SQLALCHEMY_ENGINE_OPTIONS": {"pool_size": args.pool_size, "max_overflow": 0},
+            "LOG_LEVEL": "ERROR", "ASYNC_WSGI_THREADS": args.threads,
+        })
+        flask_app = asgi_app.flask_app
+        with flask_app.app_context():
+            seed(args.rows, rng)
+            add_latency(ecommerce.db.engine, args.db_latency_ms / 1000, is_async=False)
+            ecommerce.db.engine.dispose()
+        add_latency(asgi_app.engine.sync_engine, args.db_latency_ms / 1000, is_async=True)
+
+        results = {
+            "benchmark": "async",
+            "rows": args.rows,
+            "requests": args.requests,
+            "threads": args.threads,
+            "pool_size": args.pool_size,
+            "db_latency_ms": args.db_latency_ms,
+            "levels": {},
+        }
+        parity_paths = build_paths(args.rows, 50, rng)
+        paths = build_paths(args.rows, args.requests, rng)
+
+        cache = flask_app.extensions['product_cache']
+
+        async def run_all_async():
+            try:
+                await check_parity(asgi_app, flask_app.test_client(), parity_paths)
+                runs = {}
+                for concurrency in map(int, args.concurrency.split(',')):
+                    cache.clear()
+                    runs[concurrency] = await run_async(asgi_app, paths, concurrency)
+                return runs
+            finally:
+                await asgi_app.engine.dispose()
+
+        try:
+            async_runs = asyncio.run(run_all_async())
+        finally:
+            asgi_app.executor.shutdown()
+        for concurrency, (async_results, async_seconds) in async_runs.items():
+            cache.clear()
+            sync_results, sync_seconds = run_sync(flask_app, paths, args.threads, concurrency)
+            statuses = {status for status, _ in sync_results + async_results}
+            if not statuses <= {200, 404}:
+                raise SystemExit(f"Unexpected statuses at concurrency {concurrency}: {sorted(statuses)}")
+            sync = summarize([seconds for _, seconds in sync_results], sync_seconds)
+            concurrent = summarize([seconds for _, seconds in async_results], async_seconds)
+            results["levels"][concurrency] = {
+                "sync": sync,
+                "async": concurrent,
+                "speedup": concurrent["requests_per_second"] / sync["requests_per_second"],
+            }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+"""Throughput and latency benchmark for every route in app.py.
+
+Seeds a database with configurable volumes of users, products, orders and
+order_product rows, then drives each route in-process through the Flask test
+client and records throughput and p50/p99 latency. Results are written as
+JSON so runs from different commits can be compared with --compare.
+
+Runs offline against a temporary SQLite file by default; point --database-uri
+at a local MySQL container to benchmark the real driver.
+
+Usage:
+    python benchmarks/bench_endpoints.py [--users N] [--products N] [--orders N]
+        [--lines-per-order N] [--requests N] [--database-uri URI]
+        [--output FILE] [--compare FILE]
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app as ecommerce  # noqa: E402
+
+# Rows inserted per executemany while seeding
+SEED_CHUNK_SIZE = 5000
+
+
+def git_commit():
+    """Return the current commit hash, or 'unknown' outside a git checkout."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def insert_chunked(model, rows):
+    """Insert rows for model in SEED_CHUNK_SIZE batches."""
+    db = ecommerce.db
+    for start in range(0, len(rows), SEED_CHUNK_SIZE):
+        db.session.execute(db.insert(model), rows[start:start + SEED_CHUNK_SIZE])
+    db.session.commit()
+
+
+def seed(args, requests):
+    """Create tables and seed data; return the IDs the scenarios need."""
+    db = ecommerce.db
+    rng = random.Random(args.seed)
+    db.drop_all()
+    db.create_all()
+
+    # Extra rows beyond the requested volumes are reserved for DELETE routes
+    insert_chunked(ecommerce.User, [
+        {"name": f"User {i}", "address": f"{i} Bench Street", "email": f"seed-{i}@example.com"}
+        for i in range(args.users + requests)
+    ])
+    prices = [round(rng.uniform(1, 500), 2) for _ in range(args.products + requests)]
+    insert_chunked(ecommerce.Product, [
+        {"product_name": f"Product {i}", "price": price} for i, price in enumerate(prices)
+    ])
+    now = datetime.datetime.utcnow()
+    insert_chunked(ecommerce.Order, [
+        {"user_id": rng.randint(1, args.users), "order_date": now - datetime.timedelta(minutes=i)}
+        for i in range(args.orders)
+    ])
+    # Scratch orders start empty so add/remove routes never collide
+    scratch = db.session.scalar(db.select(db.func.max(ecommerce.Order.id))) or 0
+    insert_chunked(ecommerce.Order, [{"user_id": 1, "order_date": now}, {"user_id": 1, "order_date": now}])
+
+    lines = []
+    for order_id in range(1, args.orders + 1):
+        for product_id in rng.sample(range(1, args.products + 1), args.lines_per_order):
+            lines.append({"order_id": order_id, "product_id": product_id,
+                          "quantity": rng.randint(1, 5), "unit_price": prices[product_id - 1]})
+    insert_chunked(ecommerce.OrderProduct, lines)
+    ecommerce.rebuild_order_summaries()
+    ecommerce.rebuild_sales_rollups()
+
+    return {
+        "user_ids": list(range(1, args.users + 1)),
+        "doomed_user_ids": list(range(args.users + 1, args.users + requests + 1)),
+        "product_ids": list(range(1, args.products + 1)),
+        "doomed_product_ids": list(range(args.products + 1, args.products + requests + 1)),
+        "order_ids": list(range(1, args.orders + 1)),
+        "scratch_order_id": scratch + 1,
+        "batch_order_id": scratch + 2,
+    }
+
+
+def build_scenarios(ids, rng):
+    """Return (name, make_request) pairs; make_request(i) -> (method, url, kwargs)."""
+    user = lambda i: rng.choice(ids["user_ids"])  # noqa: E731
+    product = lambda i: rng.choice(ids["product_ids"])  # noqa: E731
+    order = lambda i: rng.choice(ids["order_ids"])  # noqa: E731
+    scratch = ids["scratch_order_id"]
+    batch = ids["batch_order_id"]
+    products = ids["product_ids"]
+
+    def batch_ids(i):
+        return products[(i * 20) % len(products):(i * 20) % len(products) + 20]
+
+    return [
+        ("GET /users", lambda i: ("GET", "/users", {})),
+        ("GET /users?limit=100", lambda i: ("GET", "/users?limit=100", {})),
+        ("GET /users?stream=ndjson", lambda i: ("GET", "/users?stream=ndjson", {})),
+        ("GET /users/<id>", lambda i: ("GET", f"/users/{user(i)}", {})),
+        ("GET /users/<id>/stats", lambda i: ("GET", f"/users/{user(i)}/stats", {})),
+        ("POST /users/stats", lambda i: ("POST", "/users/stats", {"json": {
+            "user_ids": rng.sample(ids["user_ids"], min(100, len(ids["user_ids"])))}})),
+        ("POST /users", lambda i: ("POST", "/users", {"json": {
+            "name": "Bench", "address": "1 Bench Street", "email": f"new-{i}@example.com"}})),
+        ("POST /users/bulk", lambda i: ("POST", "/users/bulk", {"json": [
+            {"name": "Bulk", "address": "1 Bench Street", "email": f"bulk-{i}-{n}@example.com"}
+            for n in range(100)]})),
+        ("PUT /users/<id>", lambda i: ("PUT", f"/users/{user(i)}", {"json": {"name": f"Renamed {i}"}})),
+        ("DELETE /users/<id>", lambda i: ("DELETE", f"/users/{ids['doomed_user_ids'][i]}", {})),
+        ("GET /products", lambda i: ("GET", "/products", {})),
+        ("GET /products?limit=100", lambda i: ("GET", "/products?limit=100", {})),
+        ("GET /products?min_price&sort=price", lambda i: (
+            "GET", f"/products?min_price={i % 400}&max_price={i % 400 + 50}&sort=price&limit=100", {})),
+        ("GET /products?name_prefix", lambda i: ("GET", f"/products?name_prefix=Product {i % 100}", {})),
+        ("GET /products?stream=ndjson", lambda i: ("GET", "/products?stream=ndjson", {})),
+        # If-None-Match: * takes the same 304 path as a matching ETag
+        ("GET /products (304)", lambda i: ("GET", "/products", {"headers": {"If-None-Match": "*"}})),
+        ("GET /products/<id> (304)", lambda i: (
+            "GET", f"/products/{product(i)}", {"headers": {"If-None-Match": "*"}})),
+        ("GET /products/search", lambda i: ("GET", f"/products/search?q=product {i % 1000}", {})),
+        ("GET /products/<id>", lambda i: ("GET", f"/products/{product(i)}", {})),
+        ("POST /products", lambda i: ("POST", "/products", {"json": {"product_name": f"New {i}", "price": 9.99}})),
+        ("POST /products/bulk", lambda i: ("POST", "/products/bulk", {"json": [
+            {"product_name": f"Bulk {i}-{n}", "price": 4.5} for n in range(100)]})),
+        ("PUT /products/<id>", lambda i: ("PUT", f"/products/{product(i)}", {"json": {"price": 10 + i % 50}})),
+        ("DELETE /products/<id>", lambda i: ("DELETE", f"/products/{ids['doomed_product_ids'][i]}", {})),
+        ("POST /orders", lambda i: ("POST", "/orders", {"json": {
+            "user_id": user(i), "product_ids": rng.sample(products, 10)}})),
+        ("POST /orders (items)", lambda i: ("POST", "/orders", {"json": {
+            "user_id": user(i), "items": [{"product_id": p, "quantity": 3} for p in rng.sample(products, 10)]}})),
+        ("PUT /orders/<id>/add_product/<id>", lambda i: (
+            "PUT", f"/orders/{scratch}/add_product/{products[i]}", {})),
+        ("DELETE /orders/<id>/remove_product/<id>", lambda i: (
+            "DELETE", f"/orders/{scratch}/remove_product/{products[i]}", {})),
+        ("PUT /orders/<id>/add_products", lambda i: (
+            "PUT", f"/orders/{batch}/add_products", {"json": {"product_ids": batch_ids(i)}})),
+        ("DELETE /orders/<id>/remove_products", lambda i: (
+            "DELETE", f"/orders/{batch}/remove_products", {"json": {"product_ids": batch_ids(i)}})),
+        ("GET /orders/user/<id>", lambda i: ("GET", f"/orders/user/{user(i)}", {})),
+        ("GET /orders/<id>/products", lambda i: ("GET", f"/orders/{order(i)}/products", {})),
+        ("GET /orders/<id>/products (304)", lambda i: (
+            "GET", f"/orders/{order(i)}/products", {"headers": {"If-None-Match": "*"}})),
+        ("GET /analytics/top-products", lambda i: ("GET", "/analytics/top-products", {})),
+        ("GET /analytics/revenue?granularity=hour", lambda i: (
+            "GET", "/analytics/revenue?granularity=hour&from=" + (
+                datetime.date.today() - datetime.timedelta(days=6)).isoformat(), {})),
+        ("GET /analytics/products/<id>/sales", lambda i: ("GET", f"/analytics/products/{product(i)}/sales", {})),
+        ("GET /debug/cache", lambda i: ("GET", "/debug/cache", {})),
+        ("GET /debug/search", lambda i: ("GET", "/debug/search", {})),
+        ("GET /debug/pool", lambda i: ("GET", "/debug/pool", {})),
+        ("GET /metrics", lambda i: ("GET", "/metrics", {})),
+    ]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def run_scenario(client, make_request, requests, warmup):
+    """Issue requests sequentially and summarize latency and status codes."""
+    statuses = {}
+    latencies = []
+    for i in range(warmup + requests):
+        method, url, kwargs = make_request(i)
+        start = time.perf_counter()
+        response = client.open(url, method=method, **kwargs)
+        response.get_data()
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            latencies.append(elapsed)
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+    latencies.sort()
+    return {
+        "requests": requests,
+        "throughput_rps": requests / sum(latencies),
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "statuses": statuses,
+    }
+
+
+def compare(current, baseline_path):
+    """Print p50/p99 ratios against a previous results file."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"Comparing {current['commit']} against {baseline.get('commit')}:")
+    for route, result in current["routes"].items():
+        previous = baseline.get("routes", {}).get(route)
+        if not previous:
+            print(f"  {route:45} (new)")
+            continue
+        p50 = result["p50_ms"] / previous["p50_ms"] if previous["p50_ms"] else float('nan')
+        p99 = result["p99_ms"] / previous["p99_ms"] if previous["p99_ms"] else float('nan')
+        print(f"  {route:45} p50 x{p50:.2f}  p99 x{p99:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--products', type=int, default=5000)
+    parser.add_argument('--orders', type=int, default=2000)
+    parser.add_argument('--lines-per-order', type=int, default=5)
+    parser.add_argument('--requests', type=int, default=200, help="measured requests per route")
+    parser.add_argument('--warmup', type=int, default=10, help="unmeasured requests per route")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database-uri', help="defaults to a temporary SQLite file")
+    parser.add_argument('--output', help="defaults to benchmarks/results/<commit>.json")
+    parser.add_argument('--compare', help="previous results JSON to compare against")
+    args = parser.parse_args()
+
+    total = args.requests + args.warmup
+    if total > args.products:
+        parser.error("--products must be at least --requests + --warmup")
+
+    tmpdir = tempfile.TemporaryDirectory()
+    uri = args.database_uri or f"sqlite:///{os.path.join(tmpdir.name, 'bench.db')}"
+    flask_app = ecommerce.create_app({"SQLALCHEMY_DATABASE_URI": uri, "LOG_LEVEL": "ERROR"})
+    client = flask_app.test_client()
+
+    results = {
+        "benchmark": "endpoints",
+        "commit": git_commit(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "database": flask_app.config['SQLALCHEMY_DATABASE_URI'].split('://')[0],
+        "volumes": {
+            "users": args.users,
+            "products": args.products,
+            "orders": args.orders,
+            "order_product": args.orders * args.lines_per_order,
+        },
+        "routes": {},
+    }
+    with flask_app.app_context():
+        ids = seed(args, total)
+    rng = random.Random(args.seed)
+    for name, make_request in build_scenarios(ids, rng):
+        results["routes"][name] = run_scenario(client, make_request, args.requests, args.warmup)
+        route = results["routes"][name]
+        print(f"{name:45} {route['throughput_rps']:9.1f} req/s  "
+              f"p50 {route['p50_ms']:8.2f} ms  p99 {route['p99_ms']:8.2f} ms  {route['statuses']}")
+
+    output = args.output or os.path.join(ROOT, 'benchmarks', 'results', f"{results['commit']}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+    tmpdir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
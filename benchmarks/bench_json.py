@@ -0,0 +1,94 @@
+"""Compare JSON encoders for realistic response payloads.
+
+Builds payloads shaped like the GET /products and GET /orders/user/<id>
+responses, plus one with raw datetime values, and times the response
+encoding of each installed encoder (stdlib, orjson, ujson) through
+FastJSONProvider. Every encoder's output is checked to decode to the same
+value as the stdlib output.
+
+Usage: python benchmarks/bench_json.py [--rows N] [--repeat N] [--output FILE]
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app as ecommerce  # noqa: E402
+
+
+def build_payloads(rows, rng):
+    """Return payloads mirroring the dumped product and order listings."""
+    products = [
+        {"id": i, "product_name": f"Product {i}", "price": round(rng.uniform(1, 500), 2)}
+        for i in range(1, rows + 1)
+    ]
+    now = datetime.datetime(2025, 1, 1, 12, 0, 0, 123456)
+    orders = [
+        {
+            "id": i,
+            "order_date": (now - datetime.timedelta(minutes=i)).isoformat(),
+            "user_id": rng.randint(1, 1000),
+            "products": rng.sample(products, 5),
+        }
+        for i in range(1, rows // 5 + 1)
+    ]
+    raw_dates = [{"id": i, "order_date": now - datetime.timedelta(minutes=i)} for i in range(rows)]
+    return {"products": products, "orders": orders, "raw datetimes": raw_dates}
+
+
+def best_of(repeat, func):
+    """Return the fastest of repeat timings of func()."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help="write results JSON here instead of stdout")
+    args = parser.parse_args()
+
+    flask_app = ecommerce.create_app({"SQLALCHEMY_DATABASE_URI": "sqlite://", "LOG_LEVEL": "ERROR"})
+    encoders = [name for name in ('stdlib', 'orjson', 'ujson')
+                if name == 'stdlib' or getattr(ecommerce, name) is not None]
+    payloads = build_payloads(args.rows, random.Random(42))
+    results = {"benchmark": "json", "rows": args.rows, "encoders": encoders, "payloads": {}}
+
+    with flask_app.app_context():
+        for name, payload in payloads.items():
+            baseline = None
+            timings = {}
+            for encoder in encoders:
+                provider = ecommerce.FastJSONProvider(flask_app, encoder)
+                decoded = json.loads(provider.response(payload).get_data())
+                if baseline is None:
+                    baseline = decoded
+                elif decoded != baseline:
+                    raise SystemExit(f"{encoder} output differs from stdlib for {name}")
+                seconds = best_of(args.repeat, lambda: provider.response(payload).get_data())
+                timings[encoder] = {"ms": seconds * 1000}
+            for encoder, timing in timings.items():
+                timing["speedup_vs_stdlib"] = timings["stdlib"]["ms"] / timing["ms"]
+            results["payloads"][name] = timings
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
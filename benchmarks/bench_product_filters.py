@@ -0,0 +1,136 @@
+"""Time the index-backed product filters and sorts and record their plans.
+
+Seeds an in-memory SQLite database, builds the same SELECT that
+GET /products runs for each filter/sort combination, and records the
+EXPLAIN QUERY PLAN output under the app's own connection settings. Each
+case is then timed through the test client with the product cache
+disabled, so every request runs its SQL. The index-use checks themselves
+are asserted in tests/test_product_filter_plans.py.
+
+name_prefix's LIKE 'prefix%' only becomes an index range on SQLite when
+PRAGMA case_sensitive_like is set: SQLite's LIKE ignores case while the
+index compares with BINARY. The app does not set the pragma, so the case
+is reported with "index_needs_case_sensitive_like" and a second plan taken
+with the pragma on. MySQL's default collations are case-insensitive, and
+LIKE and the index share the column's collation, so MySQL range-scans the
+prefix either way.
+
+Usage: python benchmarks/bench_product_filters.py [--rows N] [--repeat N] [--output FILE]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app as ecommerce  # noqa: E402
+
+# (name, query string) pairs covering each filter and sort
+CASES = [
+    ("min_price", "min_price=495"),
+    ("price range", "min_price=100&max_price=101"),
+    ("name_prefix", "name_prefix=Widget 12"),
+    ("sort=price page", "sort=price&limit=100"),
+    ("sort=-price page", "sort=-price&limit=100"),
+    ("sort=product_name page", "sort=product_name&limit=100"),
+    ("price range sorted by price", "min_price=100&max_price=110&sort=price&limit=100"),
+]
+
+# Cases whose index use depends on LIKE being case-sensitive
+CASE_SENSITIVE_LIKE_CASES = {"name_prefix"}
+
+
+def seed(rows, rng):
+    """Insert rows products with random prices and names."""
+    db = ecommerce.db
+    db.create_all()
+    db.session.execute(db.insert(ecommerce.Product), [
+        {"product_name": f"{rng.choice(['Widget', 'Gadget', 'Gizmo'])} {i}", "price": round(rng.uniform(1, 500), 2)}
+        for i in range(rows)
+    ])
+    db.session.commit()
+    db.session.execute(db.text("ANALYZE"))
+
+
+def build_statement(flask_app, query_string):
+    """Compile the SELECT GET /products issues for query_string, with literal values."""
+    with flask_app.test_request_context(f"/products?{query_string}"):
+        criteria, sort = ecommerce.parse_product_filters()
+        page = ecommerce.parse_page_args(sort)
+        stmt = ecommerce.db.select(*ecommerce.product_serializer.columns(ecommerce.Product)).where(*criteria)
+        if page or 'sort' in query_string:
+            stmt = stmt.order_by(*ecommerce.sort_order(ecommerce.Product, sort))
+        if page:
+            stmt = stmt.limit(page[0] + 1)
+        return str(stmt.compile(ecommerce.db.engine, compile_kwargs={"literal_binds": True}))
+
+
+def explain(sql):
+    """Return the EXPLAIN QUERY PLAN steps for sql and whether it avoids a full scan."""
+    plan = [row[-1] for row in ecommerce.db.session.execute(ecommerce.db.text(f"EXPLAIN QUERY PLAN {sql}"))]
+    uses_index = any("USING INDEX" in step or "USING INTEGER PRIMARY KEY" in step for step in plan)
+    full_scan = any(step.startswith("SCAN product") and "INDEX" not in step for step in plan)
+    return plan, uses_index and not full_scan
+
+
+def best_of(repeat, func):
+    """Return the fastest of repeat timings of func()."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output', help="write results JSON here instead of stdout")
+    args = parser.parse_args()
+
+    # A TTL of 0 disables the product cache, so each timed request runs the SQL
+    flask_app = ecommerce.create_app({
+        "SQLALCHEMY_DATABASE_URI": "sqlite://", "LOG_LEVEL": "ERROR", "PRODUCT_CACHE_TTL": 0,
+    })
+    client = flask_app.test_client()
+    results = {"benchmark": "product_filters", "rows": args.rows, "cases": {}}
+    with flask_app.app_context():
+        seed(args.rows, random.Random(42))
+        for name, query_string in CASES:
+            sql = build_statement(flask_app, query_string)
+            plan, uses_index = explain(sql)
+            seconds = best_of(args.repeat, lambda: client.get(f"/products?{query_string}").get_data())
+            results["cases"][name] = {
+                "query": query_string,
+                "plan": plan,
+                "uses_index": uses_index,
+                "ms": seconds * 1000,
+            }
+            if name in CASE_SENSITIVE_LIKE_CASES and not uses_index:
+                # The in-memory database is one shared connection, so the
+                # pragma is switched off again before the next case is timed
+                ecommerce.db.session.execute(ecommerce.db.text("PRAGMA case_sensitive_like = ON"))
+                plan, uses_index = explain(sql)
+                ecommerce.db.session.execute(ecommerce.db.text("PRAGMA case_sensitive_like = OFF"))
+                results["cases"][name].update({
+                    "index_needs_case_sensitive_like": True,
+                    "plan_case_sensitive_like": plan,
+                    "uses_index_case_sensitive_like": uses_index,
+                })
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
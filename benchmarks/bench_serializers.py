@@ -0,0 +1,109 @@
+"""Compare the compiled fast serializers with the marshmallow schemas.
+
+Seeds an in-memory SQLite database, checks that every FastSerializer
+produces exactly the same output as its schema for ORM instances and plain
+column rows, then times both on the same objects.
+
+Usage: python benchmarks/bench_serializers.py [--rows N] [--repeat N] [--output FILE]
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app as ecommerce  # noqa: E402
+
+
+def seed(rows, rng):
+    """Insert users, products and orders with five priced lines each."""
+    db = ecommerce.db
+    db.create_all()
+    db.session.execute(db.insert(ecommerce.User), [
+        {"name": f"User {i}", "address": f"{i} Bench Street", "email": f"user-{i}@example.com"}
+        for i in range(rows)
+    ])
+    prices = [round(rng.uniform(1, 500), 2) for _ in range(rows)]
+    db.session.execute(db.insert(ecommerce.Product), [
+        {"product_name": f"Product {i}", "price": price} for i, price in enumerate(prices)
+    ])
+    now = datetime.datetime.utcnow()
+    db.session.execute(db.insert(ecommerce.Order), [
+        {"user_id": rng.randint(1, rows), "order_date": now - datetime.timedelta(seconds=i, microseconds=i)}
+        for i in range(rows)
+    ])
+    db.session.execute(db.insert(ecommerce.OrderProduct), [
+        {"order_id": order_id, "product_id": product_id,
+         "quantity": rng.randint(1, 5), "unit_price": prices[product_id - 1]}
+        for order_id in range(1, rows + 1)
+        for product_id in rng.sample(range(1, rows + 1), 5)
+    ])
+    db.session.commit()
+    ecommerce.rebuild_order_summaries()
+
+
+def best_of(repeat, func):
+    """Return the fastest of repeat timings of func()."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help="write results JSON here instead of stdout")
+    args = parser.parse_args()
+
+    flask_app = ecommerce.create_app({"SQLALCHEMY_DATABASE_URI": "sqlite://", "LOG_LEVEL": "ERROR"})
+    results = {"benchmark": "serializers", "rows": args.rows, "cases": {}}
+    with flask_app.app_context():
+        seed(args.rows, random.Random(42))
+        db = ecommerce.db
+        cases = {
+            "users (ORM)": (ecommerce.users_schema, ecommerce.user_serializer,
+                            ecommerce.User.query.all()),
+            "users (columns)": (ecommerce.users_schema, ecommerce.user_serializer,
+                                db.session.query(*ecommerce.user_serializer.columns(ecommerce.User)).all()),
+            "products (ORM)": (ecommerce.products_schema, ecommerce.product_serializer,
+                               ecommerce.Product.query.all()),
+            "products (columns)": (ecommerce.products_schema, ecommerce.product_serializer,
+                                   db.session.query(*ecommerce.product_serializer.columns(ecommerce.Product)).all()),
+            "orders with products (ORM)": (ecommerce.orders_schema, ecommerce.order_serializer,
+                                           ecommerce.order_query().all()),
+        }
+        for name, (schema, serializer, objects) in cases.items():
+            expected = schema.dump(objects)
+            actual = serializer.dump(objects, many=True)
+            if actual != expected:
+                mismatch = next(i for i, (a, b) in enumerate(zip(actual, expected)) if a != b)
+                raise SystemExit(f"{name}: output differs at row {mismatch}: "
+                                 f"{actual[mismatch]!r} != {expected[mismatch]!r}")
+            schema_seconds = best_of(args.repeat, lambda: schema.dump(objects))
+            fast_seconds = best_of(args.repeat, lambda: serializer.dump(objects, many=True))
+            results["cases"][name] = {
+                "parity": True,
+                "marshmallow_ms": schema_seconds * 1000,
+                "fast_ms": fast_seconds * 1000,
+                "speedup": schema_seconds / fast_seconds,
+            }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
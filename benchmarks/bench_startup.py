@@ -0,0 +1,69 @@
+"""Measure worker boot time: importing app.py and calling create_app().
+
+Each sample runs in a fresh interpreter whose database host points at an
+unroutable address (192.0.2.1), so a boot that touched the database would
+stall or fail instead of silently looking fast.
+
+Usage: python benchmarks/bench_startup.py [--runs N] [--output FILE]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs inside the child interpreter and prints one JSON sample
+BOOT_SNIPPET = """
+import json, time
+start = time.perf_counter()
+import app
+flask_app = app.create_app()
+boot = time.perf_counter() - start
+with flask_app.app_context():
+    pool = app.db.engine.pool
+    connections = pool.checkedin() + pool.checkedout()
+print(json.dumps({"boot_seconds": boot, "connections": connections}))
+"""
+
+
+def boot_once():
+    """Boot the app in a fresh interpreter and return its sample."""
+    env = dict(os.environ, ECOMMERCE_DB_HOST='192.0.2.1')
+    env.pop('ECOMMERCE_SQLALCHEMY_DATABASE_URI', None)
+    result = subprocess.run(
+        [sys.executable, '-c', BOOT_SNIPPET],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=60, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--output', help="write results JSON here instead of stdout")
+    args = parser.parse_args()
+
+    samples = [boot_once() for _ in range(args.runs)]
+    times = sorted(sample["boot_seconds"] for sample in samples)
+    results = {
+        "benchmark": "startup",
+        "runs": args.runs,
+        "min_seconds": times[0],
+        "median_seconds": statistics.median(times),
+        "max_seconds": times[-1],
+        "db_connections_opened": max(sample["connections"] for sample in samples),
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
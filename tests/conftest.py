@@ -0,0 +1,57 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app as ecommerce  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    """App on an in-memory SQLite database with foreign keys enforced, inside an app context."""
+    flask_app = ecommerce.create_app({"SQLALCHEMY_DATABASE_URI": "sqlite://", "LOG_LEVEL": "ERROR"})
+    with flask_app.app_context():
+        event.listen(ecommerce.db.engine, 'connect', enable_foreign_keys)
+        ecommerce.db.engine.dispose()
+        ecommerce.db.create_all()
+        yield flask_app
+        ecommerce.db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def enable_foreign_keys(dbapi_connection, connection_record):
+    """SQLite leaves foreign keys unchecked unless asked; MySQL (InnoDB) always checks them."""
+    dbapi_connection.execute("PRAGMA foreign_keys = ON")
+
+
+class QueryCounter:
+    """Count SQL statements executed on an engine while active."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, 'before_cursor_execute', self._count)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, 'before_cursor_execute', self._count)
+
+
+@pytest.fixture
+def count_queries(app):
+    """Return a context manager counting the statements run inside it."""
+    return lambda: QueryCounter(ecommerce.db.engine)
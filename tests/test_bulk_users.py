@@ -0,0 +1,27 @@
+"""Bulk user import reports email conflicts per row."""
+import app as ecommerce
+
+
+def user(email):
+    return {"name": "Bulk User", "address": "1 Bulk Street", "email": email}
+
+
+def test_emails_differing_in_case_conflict(client):
+    client.post('/users', json=user("existing@example.com"))
+    response = client.post('/users/bulk', json=[
+        user("A@example.com"), user("a@example.com"), user("Existing@Example.com"), user("b@example.com"),
+    ])
+
+    assert response.status_code == 207
+    statuses = [result["status"] for result in response.get_json()["results"]]
+    assert statuses == ["created", "conflict", "conflict", "created"]
+
+
+def test_failed_chunk_is_retried_row_by_row(app):
+    rows = [user("c@example.com"), user("c@example.com"), user("d@example.com")]
+    with app.test_request_context('/users/bulk', method='POST', json=rows):
+        created, results = ecommerce.run_bulk_insert(ecommerce.User, ecommerce.bulk_user_schema, 10)
+
+    assert created == 2
+    assert [result["status"] for result in results] == ["created", "conflict", "created"]
+    assert ecommerce.db.session.scalar(ecommerce.db.select(ecommerce.db.func.count(ecommerce.User.id))) == 2
@@ -0,0 +1,52 @@
+"""Deleting a product removes it from every order and keeps order totals and rollups in step."""
+import app as ecommerce
+
+
+def test_delete_product_in_orders(app, client):
+    db = ecommerce.db
+    client.post('/users', json={"name": "Ada", "address": "1 Street", "email": "ada@example.com"})
+    client.post('/products', json={"product_name": "Kept", "price": 2.5})
+    client.post('/products', json={"product_name": "Deleted", "price": 4.0})
+    for _ in range(2):
+        response = client.post('/orders', json={
+            "user_id": 1, "order_date": "2025-01-01T12:00:00",
+            "items": [{"product_id": 1, "quantity": 2}, {"product_id": 2, "quantity": 3}],
+        })
+        assert response.status_code == 201
+    etag = client.get('/orders/1/products').headers['ETag']
+
+    response = client.delete('/products/2')
+    assert response.status_code == 200
+
+    assert db.session.scalars(db.select(ecommerce.OrderProduct.product_id)).all() == [1, 1]
+    for order in client.get('/orders/user/1').get_json():
+        assert (order["item_count"], order["total_amount"]) == (2, 5.0)
+    assert [product["id"] for product in client.get('/orders/1/products').get_json()] == [1]
+    assert client.get('/orders/1/products', headers={'If-None-Match': etag}).status_code == 200
+
+    inline = {
+        model: sorted(tuple(row) for row in db.session.execute(db.select(*model.__table__.c)))
+        for model in (ecommerce.ProductSalesHourly, ecommerce.ProductSalesDaily, ecommerce.ProductSalesBuyer)
+    }
+    ecommerce.rebuild_sales_rollups()
+    for model, rows in inline.items():
+        assert rows == sorted(tuple(row) for row in db.session.execute(db.select(*model.__table__.c)))
+    assert db.session.scalars(db.select(ecommerce.ProductSalesDaily.product_id)).all() == [1]
+
+
+def delete_statements(client, count_queries, orders):
+    client.post('/users', json={"name": "Ada", "address": "1 Street", "email": f"ada{orders}@example.com"})
+    client.post('/products', json={"product_name": "Popular", "price": 1.5})
+    product_id = client.get('/products').get_json()[-1]["id"]
+    for i in range(orders):
+        client.post('/orders', json={
+            "user_id": 1, "order_date": f"2025-01-{i % 28 + 1:02d}T12:00:00",
+            "items": [{"product_id": product_id, "quantity": 2}],
+        })
+    with count_queries() as counter:
+        assert client.delete(f'/products/{product_id}').status_code == 200
+    return counter.count
+
+
+def test_delete_product_statements_do_not_grow_with_orders(client, count_queries):
+    assert delete_statements(client, count_queries, 1) == delete_statements(client, count_queries, 30)
@@ -0,0 +1,34 @@
+"""Per-thread metric shards are folded away when their threads exit."""
+import threading
+
+import app as ecommerce
+
+
+def test_finished_threads_do_not_accumulate_shards():
+    metrics = ecommerce.MetricsRegistry()
+    metrics.observe('/products', 'GET', 200, 0.01, 1, 0.001, 0.001, 10)
+
+    def request():
+        metrics.observe('/products', 'GET', 200, 0.01, 2, 0.001, 0.001, 10)
+
+    for _ in range(50):
+        thread = threading.Thread(target=request)
+        thread.start()
+        thread.join()
+
+    assert metrics.shard_count() == 1
+    rendered = metrics.render()
+    assert 'http_responses_total{route="/products",method="GET",status="200"} 51' in rendered
+    assert 'db_statements_total{route="/products",method="GET"} 101' in rendered
+    assert 'http_request_duration_seconds_count{route="/products",method="GET"} 51' in rendered
+
+
+def test_metrics_endpoint_after_threaded_requests(client):
+    threads = [threading.Thread(target=lambda: client.get('/products')) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+        thread.join()
+    metrics = client.application.extensions['metrics']
+    assert metrics.shard_count() == 0
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'http_responses_total{route="/products",method="GET",status="200"} 5' in body
@@ -0,0 +1,50 @@
+"""Order read endpoints must issue a fixed number of queries however many rows they return."""
+import pytest
+
+import app as ecommerce
+
+
+def seed_orders(orders, products_per_order):
+    """One user with `orders` orders, each holding the same `products_per_order` products."""
+    db = ecommerce.db
+    db.session.execute(db.insert(ecommerce.User), [{"name": "Ada", "address": "1 Street", "email": "ada@example.com"}])
+    db.session.execute(db.insert(ecommerce.Product), [
+        {"product_name": f"Product {i}", "price": 1.0 + i} for i in range(products_per_order)
+    ])
+    db.session.execute(db.insert(ecommerce.Order), [
+        {"user_id": 1, "order_date": ecommerce.datetime(2025, 1, 1, 12, i % 60)} for i in range(orders)
+    ])
+    db.session.execute(db.insert(ecommerce.OrderProduct), [
+        {"order_id": order_id, "product_id": product_id, "quantity": 1, "unit_price": 1.0 + product_id - 1}
+        for order_id in range(1, orders + 1)
+        for product_id in range(1, products_per_order + 1)
+    ])
+    db.session.commit()
+    ecommerce.rebuild_order_summaries()
+
+
+def queries_for(client, count_queries, path):
+    """Statements executed while serving one GET, after a warm-up request."""
+    assert client.get(path).status_code == 200
+    with count_queries() as counter:
+        response = client.get(path)
+    assert response.status_code == 200
+    return counter.count, response.get_json()
+
+
+@pytest.mark.parametrize("orders", [1, 50])
+def test_user_orders_query_count_is_constant(client, count_queries, orders):
+    seed_orders(orders, 3)
+    count, body = queries_for(client, count_queries, '/orders/user/1')
+    assert len(body) == orders
+    assert all(len(order["products"]) == 3 and len(order["items"]) == 3 for order in body)
+    # Orders, then one selectin query each for products and items
+    assert count == 3
+
+
+@pytest.mark.parametrize("products", [1, 50])
+def test_order_products_query_count_is_constant(client, count_queries, products):
+    seed_orders(1, products)
+    count, body = queries_for(client, count_queries, '/orders/1/products')
+    assert len(body) == products
+    assert count == 1
@@ -0,0 +1,42 @@
+"""Product cache TTL semantics and which product list responses are cached."""
+import pytest
+
+import app as ecommerce
+
+
+def test_zero_ttl_disables_cache():
+    cache = ecommerce.LRUCache(ttl=0)
+    cache.set('key', 'value')
+    assert cache.get('key') is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_negative_ttl_rejected():
+    with pytest.raises(ValueError):
+        ecommerce.LRUCache(ttl=-1)
+
+
+def list_entries(app):
+    cache = app.extensions['product_cache']
+    return sorted(key for key in cache._entries if key.startswith('products:list:'))
+
+
+def test_only_bounded_product_lists_are_cached(app, client):
+    app.config['PRODUCT_LIST_CACHE_MAX_ROWS'] = 2
+    for i in range(3):
+        client.post('/products', json={"product_name": f"Product {i}", "price": 1.0 + i})
+
+    assert len(client.get('/products').get_json()) == 3
+    assert list_entries(app) == []
+
+    assert client.get('/products?max_price=2').status_code == 200
+    assert client.get('/products?limit=2').status_code == 200
+    assert len(list_entries(app)) == 2
+
+
+def test_unknown_parameters_share_cache_entry(app, client):
+    client.post('/products', json={"product_name": "Widget", "price": 1.0})
+    first = client.get('/products?limit=10&_=1')
+    second = client.get('/products?limit=10&_=2')
+    assert len(list_entries(app)) == 1
+    assert first.headers['ETag'] == second.headers['ETag']
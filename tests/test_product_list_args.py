@@ -0,0 +1,42 @@
+"""GET /products rejects malformed filters and tampered cursors with 400."""
+import pytest
+
+import app as ecommerce
+
+
+@pytest.mark.parametrize("value", ["nan", "inf", "-Infinity"])
+def test_non_finite_price_filters_rejected(client, value):
+    for param in ("min_price", "max_price"):
+        response = client.get(f'/products?{param}={value}')
+        assert response.status_code == 400
+        assert "finite" in response.get_json()["error"]
+
+
+@pytest.mark.parametrize("sort, key", [
+    ("price", {"a": 1}), ("price", None), ("price", "1.0"), ("price", True), ("-price", [1]),
+    ("product_name", None), ("product_name", 3), ("-product_name", {"a": 1}),
+])
+def test_cursor_key_type_checked(client, sort, key):
+    client.post('/products', json={"product_name": "Widget", "price": 1.0})
+    cursor = ecommerce.encode_cursor({"id": 1, "sort": sort, "key": key})
+
+    response = client.get(f'/products?sort={sort}&after={cursor}')
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Invalid cursor"}
+
+
+def test_non_finite_cursor_key_rejected(client):
+    cursor = ecommerce.encode_cursor({"id": 1, "sort": "price", "key": float("nan")})
+    assert client.get(f'/products?sort=price&after={cursor}').status_code == 400
+
+
+def test_valid_cursor_pages_by_price(client):
+    for i in range(3):
+        client.post('/products', json={"product_name": f"Product {i}", "price": 1.0 + i})
+
+    first = client.get('/products?sort=price&limit=2').get_json()
+    second = client.get(f'/products?sort=price&limit=2&after={first["next_cursor"]}')
+
+    assert second.status_code == 200
+    assert [product["price"] for product in second.get_json()["items"]] == [3.0]
@@ -0,0 +1,10 @@
+"""Removing a product from an order reports missing orders and products as 404."""
+
+
+def test_remove_product_from_missing_order(client):
+    client.post('/products', json={"product_name": "Widget", "price": 1.0})
+
+    response = client.delete('/orders/999/remove_product/1')
+
+    assert response.status_code == 404
+    assert response.get_json() == {"error": "Order not found"}
@@ -0,0 +1,65 @@
+"""The search index follows renames, deletes and inserts made outside this worker."""
+import time
+
+import app as ecommerce
+
+
+def search_ids(client, q):
+    body = client.get('/products/search', query_string={"q": q}).get_json()
+    return [item["id"] for item in body["items"]]
+
+
+def test_changes_by_other_workers(app, client):
+    db = ecommerce.db
+    app.config['SEARCH_CATCHUP_INTERVAL'] = 3600
+    for name in ("Red Widget", "Blue Gadget", "Green Gizmo"):
+        client.post('/products', json={"product_name": name, "price": 1.0})
+    assert search_ids(client, "widget") == [1]
+
+    # Another worker renames, deletes and inserts straight in the database
+    db.session.execute(db.update(ecommerce.Product).where(ecommerce.Product.id == 1).values(product_name="Red Sprocket"))
+    db.session.execute(db.delete(ecommerce.Product).where(ecommerce.Product.id == 2))
+    db.session.execute(db.insert(ecommerce.Product).values(product_name="Yellow Widget", price=2.0))
+    db.session.commit()
+
+    # Before the next catch-up, stale hits are filtered out and their entries fixed
+    assert search_ids(client, "widget") == []
+    assert search_ids(client, "gadget") == []
+    assert ecommerce.get_search_index().stats()["products"] == 2
+
+    # The catch-up picks up the rename and the insert
+    app.config['SEARCH_CATCHUP_INTERVAL'] = 0
+    assert search_ids(client, "sprocket") == [1]
+    assert search_ids(client, "widget") == [4]
+
+
+def test_periodic_rebuild_drops_deleted_products(app, client):
+    db = ecommerce.db
+    app.config.update(SEARCH_CATCHUP_INTERVAL=3600, SEARCH_REBUILD_INTERVAL=0.01)
+    client.post('/products', json={"product_name": "Red Widget", "price": 1.0})
+    client.post('/products', json={"product_name": "Blue Widget", "price": 1.0})
+    assert search_ids(client, "widget") == [1, 2]
+    index = ecommerce.get_search_index()
+    assert index.stats()["products"] == 2
+
+    db.session.execute(db.delete(ecommerce.Product).where(ecommerce.Product.id == 2))
+    db.session.commit()
+    time.sleep(0.02)
+    client.get('/products/search?q=red')
+    with index.build_lock:
+        assert index.stats()["products"] == 1
+
+
+def test_build_sets_updated_since_with_ready(app, client):
+    index = ecommerce.ProductSearchIndex()
+    started = ecommerce.datetime.utcnow()
+
+    index.build([(1, "Red Widget")], started)
+
+    assert (index.ready, index.updated_since) == (True, started)
+
+    # A catch-up right after the build, as with SEARCH_CATCHUP_INTERVAL=0
+    app.extensions['product_search'] = index
+    app.config['SEARCH_CATCHUP_INTERVAL'] = 0
+    index.request_catchup()
+    assert client.get('/products/search', query_string={"q": "widget"}).status_code == 200